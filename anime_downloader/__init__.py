@@ -21,6 +21,21 @@ This package exports the following modules:
 
 This package exports the following package:
     sites  Anime sites.
+
+The `library` module and the `sites` package are imported on first
+access, since they pull in the HTTP and HTML parsing dependencies.
 """
 
-from anime_downloader import exceptions, library, sites
+import importlib
+
+from anime_downloader import exceptions
+
+_LAZY_SUBMODULES = {'library', 'sites'}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(f'{__name__}.{name}')
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
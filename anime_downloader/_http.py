@@ -0,0 +1,40 @@
+# Copyright (C) 2020-2021 k4leg <python.bogdan@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""The HTTP session shared by the whole package.
+
+Using one session lets `requests` keep connections alive and reuse
+them instead of opening a new TCP+TLS connection for every request.
+"""
+
+__all__ = ['SESSION']
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+    ),
+)
+
+SESSION = requests.Session()
+SESSION.mount('http://', _ADAPTER)
+SESSION.mount('https://', _ADAPTER)
@@ -0,0 +1,42 @@
+# Copyright (C) 2020-2021 k4leg <python.bogdan@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""JSON functions shared by the whole package.
+
+`orjson` is used if it is installed, otherwise the `json` module.
+"""
+
+__all__ = ['dumps', 'loads']
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """Serialize `obj` to JSON."""
+    if orjson is None:
+        return json.dumps(obj).encode()
+    return orjson.dumps(obj)
+
+
+def loads(data: bytes):
+    """Deserialize JSON."""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
@@ -24,6 +24,7 @@ import os
 import sys
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Iterable
 from urllib.parse import unquote, urlsplit
 
@@ -37,6 +38,7 @@ from rich.progress import (
     TimeRemainingColumn
 )
 
+from anime_downloader._http import SESSION
 from anime_downloader.progress_widgets import TransferSpeedColumn2
 
 __all__ = ['AbstractDownloader', 'Downloader']
@@ -79,7 +81,11 @@ class AbstractDownloader(ABC):
         If the `self.continue_` attribute is set to `True` then download
         of the file will continue instead of starting from the
         beginning.
+
+        The `self.path_to_downloads` directory is created if it does not
+        exist.
         """
+        os.makedirs(self.path_to_downloads, exist_ok=True)
         self._stage_1_download(**kwargs)
         self._stage_2_rename_temp_file_name_to_file_name()
 
@@ -102,8 +108,13 @@ class AbstractDownloader(ABC):
             self._rename(path_to_temp_file, path_to_file)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_file_name(url: str) -> str:
-        """Return the file name based on URL."""
+        """Return the file name based on URL.
+
+        The result is cached, since the name of the same URL is needed
+        at every stage of the download.
+        """
         url_path = urlsplit(url).path
         file_name = os.path.basename(unquote(url_path))
         if (
@@ -194,24 +205,26 @@ class Downloader(AbstractDownloader):
         progress.start_task(task_id)
         with open(path_to_temp_file, temp_file_flags) as temp_file:
             # 2 ** 20 B = 1048576 B = 1 Mibit
-            for data in response.iter_content(2 ** 20):
+            while data := response.raw.read(2 ** 20, decode_content=False):
                 temp_file.write(data)
-                temp_file.flush()
                 progress.update(task_id, advance=len(data))
 
     def _get_response(self, url: str, **kwargs) -> requests.Response:
         """Return the response.
 
+        The body is requested without content coding, so it can be
+        read from `response.raw` as is.
+
         For valid parameters for `**kwargs`, see the documentation for
         `requests.get`.
         """
-        headers = {}
+        headers = {'Accept-Encoding': 'identity'}
         path_to_temp_file = self.get_path_to_temp_file(url)
         if self.continue_ and os.path.exists(path_to_temp_file):
             temp_file_size = self.get_temp_file_size(url)
             headers.update(Range=f'bytes={temp_file_size}-')
 
-        response = requests.get(url, headers=headers, stream=True, **kwargs)
+        response = SESSION.get(url, headers=headers, stream=True, **kwargs)
         return response
 
     @staticmethod
@@ -35,8 +35,8 @@ class AnimeException(Exception):
 
     def __str__(self):
         if self.args:
-            return f"{self.error_message} ({', '.join(self.args)})"
-        return f"{self.error_message}"
+            return f"{self.error_message} ({', '.join(map(str, self.args))})"
+        return self.error_message
 
 
 class SearchQueryLenError(AnimeException):
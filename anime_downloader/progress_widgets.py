@@ -7,12 +7,16 @@ This module exports the following function:
     binary  Convert a file size (in bytes) to a string.
 """
 
-from rich.filesize import _to_str, decimal
+from rich.filesize import decimal
 from rich.progress import Task, TransferSpeedColumn
 from rich.text import Text
 
 __all__ = ['binary', 'TransferSpeedColumn2']
 
+_BINARY_SUFFIXES = (
+    'bytes', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB', 'EiB', 'ZiB', 'YiB'
+)
+
 
 def binary(size: int) -> str:
     """Convert a file size (in bytes) to a string.
@@ -22,10 +26,16 @@ def binary(size: int) -> str:
         '29.3 KiB'
         >>> binary(489175685241)
         '455.6 GiB'
+
+    The suffix is picked from the bit length of the size instead of
+    comparing the size with every power of 1024.
     """
-    return _to_str(
-        size, ('KiB', 'MiB', 'GiB', 'TiB', 'PiB', 'EiB', 'ZiB', 'YiB'), 1024
-    )
+    if size == 1:
+        return "1 byte"
+    i = min((size.bit_length() - 1) // 10, len(_BINARY_SUFFIXES) - 1)
+    if i <= 0:
+        return f"{size:,} bytes"
+    return f"{size / (1 << 10 * i):,.1f} {_BINARY_SUFFIXES[i]}"
 
 
 class TransferSpeedColumn2(TransferSpeedColumn):
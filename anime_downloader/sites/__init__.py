@@ -21,8 +21,5 @@ This package exports the following modules:
 
 from anime_downloader.sites import animevost
 
-sites = {
-    site: eval(site)
-    for site in dir()
-    if not site.startswith('__') and not site.endswith('__')
-}
+# Site name -> site module.  A new site must be added here.
+sites = {'animevost': animevost}
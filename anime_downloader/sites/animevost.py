@@ -28,68 +28,98 @@ This module exports the following function:
 
 __all__ = ['Anime', 'SearchQuery', 'get_recent_anime']
 
+import hashlib
 import re
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
-import requests
+from lxml import etree
 
-from anime_downloader import library
+from anime_downloader import _json, library
+from anime_downloader._http import SESSION
 from anime_downloader.exceptions import *
 
 ANIMEVOST_URL = 'https://animevost.org'
+ANIMEVOST_API_PLAYLIST_URL = 'https://api.animevost.org/v1/playlist'
+
+_ID_RE = re.compile(r'(?<=/)\d+(?=-)')
+_EPISODE_RE = re.compile(r'\d+')
+
+_TITLE_XPATH = etree.XPath(
+    "(//*[contains(concat(' ', normalize-space(@class), ' '),"
+    " ' shortstoryHead ')]//h1)[1]"
+)
+_SEARCH_RESULTS_XPATH = etree.XPath(
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' shortstory ')]"
+    "/descendant::a[1]"
+)
+_RECENT_ANIME_XPATH = etree.XPath(
+    "(//*[@class='raspis raspis_fixed'])[1]//a"
+)
 
 
 class Anime(library.Anime):
+    __slots__ = ('id', '_playlist_digest')
+
     def __init__(self, url: str, title: Optional[str] = None) -> None:
         self.url = url
         self.title = self._get_title() if title is None else title
         self.id = self._get_id()
-        self.update_playlist()
 
     def update_playlist(self) -> None:
         """Update `self.playlist`.
 
         Sets `self.is_modified_after_update` to `True` if
-        `self.playlist` has been updated else `False`.
+        `self.playlist` has been updated else `False`.  If the API
+        response is the same as the previous one, the playlist is not
+        rebuilt.
         """
-        playlist = library.Playlist(self._get_urls_to_episodes())
+        response = SESSION.post(ANIMEVOST_API_PLAYLIST_URL, {'id': self.id})
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if digest == getattr(self, '_playlist_digest', None):
+            self.is_modified_after_update = False
+            return
+
+        episodes = _json.loads(response.content)
+        urls_to_episodes = self._get_urls_to_episodes(episodes)
+        playlist = library.Playlist(urls_to_episodes)
         try:
-            self.is_modified_after_update = self.playlist != playlist
+            self.is_modified_after_update = self._playlist != playlist
         except AttributeError:
             self.is_modified_after_update = True
         self.playlist = playlist
+        self._playlist_digest = digest
 
     def _get_title(self) -> str:
         """Return the title."""
         page = library.get_page(self.url)
-        title = page.find(class_='shortstoryHead')
-        title = str(title.h1.string).strip()
+        title = _TITLE_XPATH(page)[0]
+        title = str(title.text_content()).strip()
         return _format_title(title)
 
     def _get_id(self) -> int:
         """Return the id."""
         try:
-            return int(re.search(r'(?<=/)\d+(?=-)', self.url).group())
+            return int(_ID_RE.search(self.url).group())
         except AttributeError:
             raise URLHasNoIDError(self.url) from None
 
-    def _get_urls_to_episodes(self) -> List[str]:
-        """Return a list of episodes urls."""
-        urls_to_episodes = requests.post(
-            'https://api.animevost.org/v1/playlist', {'id': self.id}
-        ).json()
+    @staticmethod
+    def _get_urls_to_episodes(episodes: List[dict]) -> List[str]:
+        """Return a list of episodes urls from the API playlist."""
         res = {}
-        for i in urls_to_episodes:
+        for i in episodes:
             try:
-                episode = int(re.search(r'\d+', i['name']).group())
+                episode = int(_EPISODE_RE.search(i['name']).group())
             except AttributeError:
                 episode = float('-inf')
-            url = i['hd']
-            res[episode] = url
-        return [res[i] for i in sorted(res)]
+            res[episode] = i['hd']
+        return [url for _, url in sorted(res.items())]
 
 
 class SearchQuery(library.SearchQuery):
+    __slots__ = ()
+
     def _get_search_query_results(self) -> Tuple[Anime, ...]:
         """Return a tuple of anime.
 
@@ -108,12 +138,11 @@ class SearchQuery(library.SearchQuery):
             'story': self._search_query_text,
         }
         animevost = library.get_page(ANIMEVOST_URL, params=search_query_params)
-        animevost = animevost(class_='shortstory')
+        animevost = _SEARCH_RESULTS_XPATH(animevost)
 
-        urls = [str(i.a['href']) for i in animevost]
-        titles = [str(i.a.string) for i in animevost]
         res = []
-        for url, title in zip(urls, titles):
+        for i in animevost:
+            url, title = str(i.get('href')), str(i.text_content())
             if self._format:
                 title = _format_title(title)
             res.append(Anime(url, title))
@@ -125,24 +154,26 @@ class SearchQuery(library.SearchQuery):
 def get_recent_anime(*, format: bool = True) -> List[Anime]:
     """Return a list of the latest anime from the animevost site."""
     animevost = library.get_page(ANIMEVOST_URL)
-    recent_anime_list = animevost.find(class_='raspis raspis_fixed')
-    recent_anime_list = recent_anime_list('a')
+    recent_anime_list = _RECENT_ANIME_XPATH(animevost)
 
-    urls = [str(i['href']) for i in recent_anime_list]
-    titles = [str(i.string) for i in recent_anime_list]
     res = []
-    for url, title in zip(urls, titles):
+    for i in recent_anime_list:
+        url, title = str(i.get('href')), str(i.text_content())
         if format:
             title = _format_title(title)
         res.append(Anime(url, title))
     return res
 
 
+@lru_cache(maxsize=4096)
 def _format_title(title: str) -> str:
     """Formats the title.
 
+    The result is cached, since the same titles come up again in the
+    search results and in the list of recent anime.
+
     Example:
     >>> _format_title('Бездарная Нана / Munou na Nana')
     'Бездарная Нана'
     """
-    return re.sub(' /.*', '', title)
+    return title.partition(' /')[0]